@@ -0,0 +1,21 @@
+"""
+JSON helpers shared by the HCVSS clients. orjson is used when installed, otherwise the stdlib
+json module.
+"""
+
+try:
+    import orjson
+
+    loads = orjson.loads
+    dumps = orjson.dumps
+except ImportError:
+    import json
+
+    def loads(data):
+        # Unlike orjson, json.loads does not accept memoryviews
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+    def dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
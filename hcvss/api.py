@@ -2,25 +2,314 @@
 This module provides the API for HCVSS.
 """
 
+import collections
+import concurrent.futures
 import os
+import threading
+import time
+from typing import Literal
+from urllib.parse import urlencode
 import requests
-from .hcvss import SecretsScanner
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from ._json import dumps as _dumps, loads as _loads
+from .constants import (
+    HTTP_GATEWAY_TIMEOUT,
+    HTTP_INTERNAL_SERVER_ERROR,
+    HTTP_SERVICE_UNAVAILABLE,
+    HTTP_THIRD_PARTY_ERROR,
+    HTTP_TOO_MANY_REQUESTS
+)
+
+# Upper bound on the worker threads used for concurrent fan-out requests
+MAX_WORKERS = 32
+
+# Default (connect, read) timeout, in seconds, for every request to Vault
+DEFAULT_TIMEOUT = (3.05, 10)
+
+# The HTTP method and KV v2 endpoint of every client method
+_ROUTES = {
+    "configure_kv_engine": ("POST", "config"),
+    "read_kv_engine_config": ("GET", "config"),
+    "read_secret_version": ("GET", "data"),
+    "create_secret": ("POST", "data"),
+    "patch_secret": ("PATCH", "data"),
+    "read_secret_subkeys": ("GET", "subkeys"),
+    "delete_secret": ("DELETE", "data"),
+    "delete_secret_versions": ("POST", "delete"),
+    "undelete_secret_versions": ("POST", "undelete"),
+    "destroy_secret_versions": ("POST", "destroy"),
+    "list_secrets": ("GET", "metadata"),
+    "read_secret_metadata": ("GET", "metadata"),
+    "update_secret_metadata": ("POST", "metadata"),
+    "patch_secret_metadata": ("PATCH", "metadata"),
+    "delete_secret_metadata_and_all_versions": ("DELETE", "metadata"),
+}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request while Vault is considered unavailable."""
+
+
+class _CircuitBreaker:
+    """Stops sending requests for a while after too many consecutive failures.
+
+    Once `reset_after` seconds have passed a single request is let through again. If it fails, the
+    circuit opens for another period, otherwise it closes.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_after: float = 30):
+        self._failure_threshold = failure_threshold
+        self._reset_after = reset_after
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at < self._reset_after:
+                raise CircuitOpenError("Vault is unavailable, not sending the request")
+            self._opened_at = None
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self._failure_threshold:
+                self._opened_at = time.monotonic()
 
 
 class HCVSSClient:
     """A client for interacting with the HCVSS project."""
 
-    def __init__(self, vault_token: str = ""):
+    __slots__ = (
+        "vault_token", "headers", "session", "_secrets_scanner", "_base", "_read_cache", "_cache_lock",
+        "_breaker", "_body_arg", "_send_kwargs"
+    )
+
+    def __init__(self, vault_token: str = "", base_url: str = None, pool_maxsize: int = 64, transport: Literal["requests", "httpx"] = "requests", cache_ttl: float = 30, timeout: tuple = DEFAULT_TIMEOUT):
         """
         Initialize the HCVSS client.
 
         Args:
             vault_token (str, optional): The Vault token to use. If not provided,
                 will attempt to get from VAULT_TOKEN environment variable.
+            base_url (str, optional): The URL every endpoint path is appended to. If not provided,
+                the HCP app URL of the secrets scanner is used, which requires the HCP_* environment
+                variables to be set.
+            pool_maxsize (int, optional): The maximum number of connections kept open per host.
+                Raise this when many threads share the client. Defaults to 64.
+            transport (str, optional): The HTTP library used to talk to Vault. "requests" uses a
+                pooled HTTP/1.1 session. "httpx" uses an HTTP/2 client, which multiplexes
+                concurrent requests over a single connection and requires the `http2` extra.
+                Defaults to "requests".
+            cache_ttl (float, optional): How long, in seconds, the engine configuration, secret
+                versions, listings, metadata and subkeys are cached before being fetched again. Writes made
+                through this client evict the affected entries. Defaults to 30.
+            timeout (tuple, optional): The (connect, read) timeout of every request, in seconds.
+                Defaults to (3.05, 10).
+
+        Raises:
+            ValueError: If `transport` is not a supported value.
         """
         self.vault_token = vault_token or os.environ.get("VAULT_TOKEN")
         self.headers = {"X-Vault-Token": self.vault_token}
-        self.secrets_scanner = SecretsScanner()
+        self._secrets_scanner = None
+        self._base = (base_url or self.secrets_scanner.base_url).rstrip("/")
+        self._read_cache = TTLCache(maxsize=4096, ttl=cache_ttl)
+        self._cache_lock = threading.Lock()
+        self._breaker = _CircuitBreaker()
+        if transport == "requests":
+            self.session = requests.Session()
+            self.session.headers.update(self.headers)
+            self.session.headers["Content-Type"] = "application/json"
+            self._body_arg = "data"
+            self._send_kwargs = {"timeout": timeout}
+            # Only idempotent verbs are replayed: a 502/504 from a proxy can mean a write already
+            # landed, and resending it would break CAS sequences or create duplicate versions.
+            # Once retries are exhausted Vault's own error body is returned rather than raised.
+            retry = Retry(
+                total=3,
+                connect=3,
+                read=3,
+                status=3,
+                backoff_factor=0.25,
+                status_forcelist=(HTTP_TOO_MANY_REQUESTS, HTTP_THIRD_PARTY_ERROR, HTTP_SERVICE_UNAVAILABLE, HTTP_GATEWAY_TIMEOUT),
+                allowed_methods=frozenset(["GET", "DELETE"]),
+                raise_on_status=False
+            )
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=pool_maxsize, max_retries=retry)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+        elif transport == "httpx":
+            import httpx
+
+            # httpx only retries failed connection attempts; it has no status-based retries.
+            limits = httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize // 2)
+            headers = {name: value for name, value in self.headers.items() if value is not None}
+            self.session = httpx.Client(
+                headers={**headers, "Content-Type": "application/json"},
+                transport=httpx.HTTPTransport(http2=True, limits=limits, retries=3),
+                timeout=httpx.Timeout(timeout[1], connect=timeout[0])
+            )
+            self._body_arg = "content"
+            self._send_kwargs = {}
+        else:
+            raise ValueError(f"Unsupported transport: {transport}")
+
+    @property
+    def secrets_scanner(self):
+        """The secrets scanner, created on first access."""
+        if self._secrets_scanner is None:
+            from .hcvss import SecretsScanner
+
+            self._secrets_scanner = SecretsScanner()
+        return self._secrets_scanner
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the underlying HTTP session and release its pooled connections."""
+        self.session.close()
+
+    def _send(self, method: str, url: str, body=None):
+        """
+        Send a request over the shared session. After five consecutive failed requests, either
+        server errors or transport errors, no request is sent for 30 seconds.
+
+        Args:
+            method (str): The HTTP method to use.
+            url (str): The URL to send the request to.
+            body (optional): An object to encode as the JSON request body.
+
+        Returns:
+            The response of the transport.
+
+        Raises:
+            CircuitOpenError: If Vault has failed too many times in a row recently.
+        """
+        self._breaker.before_call()
+        kwargs = dict(self._send_kwargs)
+        if body is not None:
+            kwargs[self._body_arg] = _dumps(body)
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except Exception:
+            self._breaker.record_failure()
+            raise
+        if response.status_code >= HTTP_INTERNAL_SERVER_ERROR:
+            self._breaker.record_failure()
+        else:
+            self._breaker.record_success()
+        return response
+
+    def _request(self, method: str, url: str, body=None):
+        """
+        Send a request over the shared session and decode its JSON response.
+
+        Args:
+            method (str): The HTTP method to use.
+            url (str): The URL to send the request to.
+            body (optional): An object to encode as the JSON request body.
+
+        Returns:
+            The decoded response, or None if the response has no body.
+        """
+        content = self._send(method, url, body).content
+        return _loads(content) if content else None
+
+    def _cached_get(self, name: str, secret_mount_path: str, path: str, url: str):
+        """
+        Return the cached response for `url`, fetching it on a miss. Only successful responses
+        are cached. The raw body is stored and decoded on every hit, so callers may modify the
+        result without affecting the cache.
+
+        Args:
+            name (str): The name of the calling method.
+            secret_mount_path (str): The mount the URL belongs to, used for invalidation.
+            path (str): The secret or folder the URL belongs to, used for invalidation.
+            url (str): The URL to fetch.
+
+        Returns:
+            The decoded response, or None if the response has no body.
+        """
+        key = (name, secret_mount_path, path, url)
+        with self._cache_lock:
+            content = self._read_cache.get(key)
+        if content is None:
+            response = self._send("GET", url)
+            content = response.content
+            if 200 <= response.status_code < 300:
+                with self._cache_lock:
+                    self._read_cache[key] = content
+        return _loads(content) if content else None
+
+    def _call(self, name: str, secret_mount_path: str, path: str = None, query: dict = None, body=None):
+        """
+        Send the request of the client method `name`, as described by `_ROUTES`. Reads are
+        served from the cache, and writes evict the cached responses they affect.
+
+        Args:
+            name (str): The name of the client method.
+            secret_mount_path (str): The path where the KV secrets engine is mounted.
+            path (str, optional): The path of the secret or folder. Not set for the engine
+                configuration, in which case writes evict every cached response of the mount.
+            query (dict, optional): The query parameters to add to the URL.
+            body (optional): An object to encode as the JSON request body.
+
+        Returns:
+            The decoded response, or None if the response has no body.
+        """
+        method, endpoint = _ROUTES[name]
+        url = self._base + "/" + secret_mount_path + "/" + endpoint
+        if path is not None:
+            url += "/" + path
+        if query:
+            url += "?" + urlencode(query)
+        if method == "GET":
+            return self._cached_get(name, secret_mount_path, path, url)
+        response = self._request(method, url, body)
+        self.invalidate(secret_mount_path, path)
+        return response
+
+    def invalidate(self, secret_mount_path: str, path: str = None):
+        """
+        Evicts cached responses so the next read goes to Vault. Every write made through this
+        client calls this automatically.
+
+        Args:
+            secret_mount_path (str): The path where the KV secrets engine is mounted.
+            path (str, optional): The path of the secret that changed. Its versions, metadata and
+                subkeys are evicted, along with the listings of the folders containing it. If not set, every
+                cached response for the mount is evicted.
+        """
+        with self._cache_lock:
+            for key in list(self._read_cache.keys()):
+                name, mount, cached_path, _ = key
+                if mount != secret_mount_path:
+                    continue
+                if (
+                    path is None
+                    or cached_path == path
+                    or (name == "list_secrets" and path.startswith(cached_path))
+                ):
+                    self._read_cache.pop(key, None)
+
+    def clear_cache(self):
+        """Evicts every cached response."""
+        with self._cache_lock:
+            self._read_cache.clear()
 
     def configure_kv_engine(self, secret_mount_path: str, max_versions: int = 0, cas_required: bool = False, delete_version_after: str = "0s"):
         """
@@ -37,14 +326,12 @@ class HCVSSClient:
                 time before a version is deleted. Accepts duration format strings like "30s" or "1h".
                 Defaults to "0s" (no automatic deletion).
         """
-        url = f"{self.secrets_scanner.base_url}/{secret_mount_path}/config"
         data = {
             "max_versions": max_versions,
             "cas_required": cas_required,
             "delete_version_after": delete_version_after
         }
-        # https://127.0.0.1:8200/v1/secret/data/my-secret
-        response = requests.post(url, headers=self.headers, json=data)
+        self._call("configure_kv_engine", secret_mount_path, body=data)
 
     def read_kv_engine_config(self, secret_mount_path: str):
         """
@@ -53,9 +340,7 @@ class HCVSSClient:
         Args:
             secret_mount_path (str): The path where the KV secrets engine is mounted.
         """
-        url = f"{self.secrets_scanner.base_url}/{secret_mount_path}/config"
-        response = requests.get(url, headers=self.headers)
-        return response.json()
+        return self._call("read_kv_engine_config", secret_mount_path)
 
     def read_secret_version(self, secret_mount_path: str, path: str, version: int = 0):
         """
@@ -69,9 +354,57 @@ class HCVSSClient:
             path (str): The path to the secret to read.
             version (int, optional): The version of the secret to return.  If not set, the latest version is returned.
         """
-        url = f"{self.secrets_scanner.base_url}/{secret_mount_path}/data/{path}?version={version}"
-        response = requests.get(url, headers=self.headers)
-        return response.json()
+        query = {"version": version} if version else None
+        return self._call("read_secret_version", secret_mount_path, path, query)
+
+    def read_secrets_bulk(self, secret_mount_path: str, paths: list, versions: list = None, max_workers: int = MAX_WORKERS):
+        """
+        Reads several secrets concurrently. The requests share the client's pooled session, so
+        the worker threads reuse warm connections instead of paying one round trip after another.
+
+        Args:
+            secret_mount_path (str): The path where the KV secrets engine is mounted.
+            paths (list): The paths of the secrets to read.
+            versions (list, optional): The version to read for each path, in the same order as
+                `paths`. A version of 0 returns the latest version. If not set, the latest version
+                of every secret is returned.
+            max_workers (int, optional): The maximum number of secrets read at once. Defaults to
+                `MAX_WORKERS`.
+
+        Returns:
+            dict: The response for each secret, keyed by path.
+
+        Raises:
+            ValueError: If `max_workers` is less than 1, or if `versions` and `paths` differ in
+                length.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if versions is not None and len(versions) != len(paths):
+            raise ValueError("versions must have one entry per path")
+        if not paths:
+            return {}
+        versions = versions or [0] * len(paths)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(paths))) as executor:
+            futures = {
+                executor.submit(self.read_secret_version, secret_mount_path, path, version or 0): path
+                for path, version in zip(paths, versions)
+            }
+            return {futures[future]: future.result() for future in concurrent.futures.as_completed(futures)}
+
+    def bulk_read_secret_versions(self, secret_mount_path: str, paths: list, max_workers: int = 16):
+        """
+        Reads the latest version of several secrets concurrently. See `read_secrets_bulk`.
+
+        Args:
+            secret_mount_path (str): The path where the KV secrets engine is mounted.
+            paths (list): The paths of the secrets to read.
+            max_workers (int, optional): The maximum number of secrets read at once. Defaults to 16.
+
+        Returns:
+            dict: The response for each secret, keyed by path.
+        """
+        return self.read_secrets_bulk(secret_mount_path, paths, max_workers=max_workers)
 
     def create_secret(self, secret_mount_path: str, path: str, cas: int, data: dict):
         """
@@ -91,11 +424,9 @@ class HCVSSClient:
                 version.
             data (dict): The contents of the data dict will be stored and returned on read.
         """
-        url = f"{self.secrets_scanner.base_url}/{secret_mount_path}/data/{path}"
         options = {"cas": cas}
         payload = {"options": options, "data": data}
-        response = requests.post(url, headers=self.headers, json=payload)
-        return response.json()
+        return self._call("create_secret", secret_mount_path, path, body=payload)
 
     def patch_secret(self, secret_mount_path: str, path: str, options: dict, cas: int, data: dict):
         """
@@ -116,9 +447,7 @@ class HCVSSClient:
             data (dict): The contents of the data map will be applied as a partial update to the
                 existing entry via a JSON merge patch to the existing entry.
         """
-        url = f"{self.secrets_scanner.base_url}/{secret_mount_path}/data/{path}"
-        response = requests.patch(url, headers=self.headers, json=data)
-        return response.json()
+        return self._call("patch_secret", secret_mount_path, path, body=data)
 
     def read_secret_subkeys(self, secret_mount_path: str, path: str, version: int = 0, depth: int = 0):
         """
@@ -136,9 +465,7 @@ class HCVSSClient:
                 specified depth value will be artificially treated as leaves and will thus be null
                 even if further underlying subkeys exist.
         """
-        url = f"{self.secrets_scanner.base_url}/{secret_mount_path}/subkeys/{path}"
-        response = requests.get(url, headers=self.headers)
-        return response.json()
+        return self._call("read_secret_subkeys", secret_mount_path, path)
 
     def delete_secret(self, secret_mount_path: str, path: str):
         """
@@ -150,9 +477,7 @@ class HCVSSClient:
             secret_mount_path (str): The path where the KV secrets engine is mounted.
             path (str): The path to the secret to delete.
         """
-        url = f"{self.secrets_scanner.base_url}/{secret_mount_path}/data/{path}"
-        response = requests.delete(url, headers=self.headers)
-        return response.json()
+        return self._call("delete_secret", secret_mount_path, path)
 
     def delete_secret_versions(self, secret_mount_path: str, path: str, versions: list):
         """
@@ -166,9 +491,7 @@ class HCVSSClient:
             versions (list): The versions to be deleted. The versioned data will not be deleted, but
                 it will no longer be returned in normal get requests.
         """
-        url = f"{self.secrets_scanner.base_url}/{secret_mount_path}/delete/{path}"
-        response = requests.post(url, headers=self.headers, json={"versions": versions})
-        return response.json()
+        return self._call("delete_secret_versions", secret_mount_path, path, body={"versions": versions})
 
     def undelete_secret_versions(self, secret_mount_path: str, path: str, versions: list):
         """
@@ -181,9 +504,7 @@ class HCVSSClient:
             versions (list): The versions to be undeleted. The versions will be restored and their
                 data will be returned on normal get requests.
         """
-        url = f"{self.secrets_scanner.base_url}/{secret_mount_path}/undelete/{path}"
-        response = requests.post(url, headers=self.headers, json={"versions": versions})
-        return response.json()
+        return self._call("undelete_secret_versions", secret_mount_path, path, body={"versions": versions})
 
     def destroy_secret_versions(self, secret_mount_path: str, path: str, versions: list):
         """
@@ -196,9 +517,7 @@ class HCVSSClient:
             versions (list): The versions to be destroyed. The versions will be permanently removed
                 from the key-value store.
         """
-        url = f"{self.secrets_scanner.base_url}/{secret_mount_path}/destroy/{path}"
-        response = requests.post(url, headers=self.headers, json={"versions": versions})
-        return response.json()
+        return self._call("destroy_secret_versions", secret_mount_path, path, body={"versions": versions})
 
     def list_secrets(self, secret_mount_path: str, path: str):
         """
@@ -215,9 +534,32 @@ class HCVSSClient:
             secret_mount_path (str): The path where the KV secrets engine is mounted.
             path (str): The path to the secrets to list.
         """
-        url = f"{self.secrets_scanner.base_url}/{secret_mount_path}/metadata/{path}"
-        response = requests.get(url, headers=self.headers)
-        return response.json()
+        return self._call("list_secrets", secret_mount_path, path, {"list": "true"})
+
+    def list_all_secrets_recursive(self, secret_mount_path: str, path: str = ""):
+        """
+        Walks the folder tree below the specified location and returns the path of every secret
+        found. The folders at each level are listed concurrently over the client's pooled session.
+
+        Args:
+            secret_mount_path (str): The path where the KV secrets engine is mounted.
+            path (str, optional): The folder to start from. Defaults to the root of the mount.
+
+        Returns:
+            list: The full paths of all secrets below `path`.
+        """
+        if path and not path.endswith("/"):
+            path += "/"
+        secrets = []
+        folders = [path]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            while folders:
+                listings = executor.map(lambda folder: (folder, self.list_secrets(secret_mount_path, folder)), folders)
+                folders = []
+                for folder, listing in listings:
+                    for key in (listing.get("data") or {}).get("keys", []):
+                        (folders if key.endswith("/") else secrets).append(folder + key)
+        return secrets
 
     def read_secret_metadata(self, secret_mount_path: str, path: str):
         """
@@ -228,9 +570,7 @@ class HCVSSClient:
             secret_mount_path (str): The path where the KV secrets engine is mounted.
             path (str): The path to the secret to read.
         """
-        url = f"{self.secrets_scanner.base_url}/{secret_mount_path}/metadata/{path}"
-        response = requests.get(url, headers=self.headers)
-        return response.json()
+        return self._call("read_secret_metadata", secret_mount_path, path)
 
     def update_secret_metadata(self, secret_mount_path: str, path: str, max_versions: int = 0, cas_required: bool = False, delete_version_after: str = "0s", custom_metadata: dict = None):
         """
@@ -253,15 +593,13 @@ class HCVSSClient:
             custom_metadata (dict, optional):  A map of arbitrary string to string valued
                 user-provided metadata meant to describe the secret.
         """
-        url = f"{self.secrets_scanner.base_url}/{secret_mount_path}/metadata/{path}"
         data = {
             "max_versions": max_versions,
             "cas_required": cas_required,
             "delete_version_after": delete_version_after,
             "custom_metadata": custom_metadata
         }
-        response = requests.post(url, headers=self.headers, json=data)
-        return response.json()
+        return self._call("update_secret_metadata", secret_mount_path, path, body=data)
 
     def patch_secret_metadata(self, secret_mount_path: str, path: str, max_versions: int = 0, cas_required: bool = False, delete_version_after: str = "0s", custom_metadata: dict = None):
         """
@@ -287,15 +625,13 @@ class HCVSSClient:
             custom_metadata (dict, optional):  A map of arbitrary string to string valued
                 user-provided metadata meant to describe the secret.
         """
-        url = f"{self.secrets_scanner.base_url}/{secret_mount_path}/metadata/{path}"
         data = {
             "max_versions": max_versions,
             "cas_required": cas_required,
             "delete_version_after": delete_version_after,
             "custom_metadata": custom_metadata
         }
-        response = requests.patch(url, headers=self.headers, json=data)
-        return response.json()
+        return self._call("patch_secret_metadata", secret_mount_path, path, body=data)
 
     def delete_secret_metadata_and_all_versions(self, secret_mount_path: str, path: str):
         """
@@ -306,6 +642,85 @@ class HCVSSClient:
             secret_mount_path (str): The path where the KV secrets engine is mounted.
             path (str): The path to the secret to delete.
         """
-        url = f"{self.secrets_scanner.base_url}/{secret_mount_path}/metadata/{path}"
-        response = requests.delete(url, headers=self.headers)
-        return response.json()
+        return self._call("delete_secret_metadata_and_all_versions", secret_mount_path, path)
+
+
+class BufferedHCVSSClient(HCVSSClient):
+    """An HCVSS client that queues secret writes and issues them from a pool of workers.
+
+    `create_secret`, `patch_secret` and `update_secret_metadata` return a
+    `concurrent.futures.Future` immediately, so a loop of writes is pipelined over the client's
+    session instead of paying one round trip after another. Writes to the same secret are still
+    issued one at a time in submission order, so check-and-set versions apply as expected.
+    """
+
+    __slots__ = ("_executor", "_pending", "_pending_lock", "_closed")
+
+    def __init__(self, vault_token: str = "", workers: int = 8, **kwargs):
+        """
+        Initialize the buffered HCVSS client.
+
+        Args:
+            vault_token (str, optional): The Vault token to use. If not provided,
+                will attempt to get from VAULT_TOKEN environment variable.
+            workers (int, optional): The number of threads issuing the writes. Defaults to 8.
+            **kwargs: Passed through to `HCVSSClient`.
+        """
+        super().__init__(vault_token, **kwargs)
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._closed = False
+
+    def close(self):
+        """Wait for the queued writes to finish, then close the underlying HTTP session."""
+        with self._pending_lock:
+            self._closed = True
+        self._executor.shutdown(wait=True)
+        super().close()
+
+    def create_secret(self, secret_mount_path: str, path: str, cas: int, data: dict) -> concurrent.futures.Future:
+        """Queues `HCVSSClient.create_secret` and returns a future for its response."""
+        return self._submit(super().create_secret, secret_mount_path, path, cas, data)
+
+    def patch_secret(self, secret_mount_path: str, path: str, options: dict, cas: int, data: dict) -> concurrent.futures.Future:
+        """Queues `HCVSSClient.patch_secret` and returns a future for its response."""
+        return self._submit(super().patch_secret, secret_mount_path, path, options, cas, data)
+
+    def update_secret_metadata(self, secret_mount_path: str, path: str, max_versions: int = 0, cas_required: bool = False, delete_version_after: str = "0s", custom_metadata: dict = None) -> concurrent.futures.Future:
+        """Queues `HCVSSClient.update_secret_metadata` and returns a future for its response."""
+        return self._submit(super().update_secret_metadata, secret_mount_path, path, max_versions, cas_required, delete_version_after, custom_metadata)
+
+    def _submit(self, write, secret_mount_path: str, path: str, *args) -> concurrent.futures.Future:
+        future = concurrent.futures.Future()
+        key = (secret_mount_path, path)
+        item = (future, write, (secret_mount_path, path, *args))
+        with self._pending_lock:
+            if self._closed:
+                raise RuntimeError("Cannot queue a write on a closed client")
+            pending = self._pending.get(key)
+            if pending is not None:
+                pending.append(item)
+                return future
+            self._pending[key] = collections.deque([item])
+        self._executor.submit(self._drain, key)
+        return future
+
+    def _drain(self, key: tuple):
+        while True:
+            with self._pending_lock:
+                pending = self._pending[key]
+                if not pending:
+                    del self._pending[key]
+                    return
+                future, write, args = pending.popleft()
+            self._do_write(future, write, args)
+
+    @staticmethod
+    def _do_write(future: concurrent.futures.Future, write, args):
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(write(*args))
+        except BaseException as e:
+            future.set_exception(e)
@@ -0,0 +1,236 @@
+"""
+This module provides an asyncio-based API for HCVSS.
+"""
+
+import asyncio
+import functools
+import os
+from urllib.parse import urlencode
+
+import aiohttp
+
+from ._json import dumps as _dumps, loads as _loads
+from .api import DEFAULT_TIMEOUT
+
+
+class AsyncHCVSSClient:
+    """An asyncio client for interacting with the HCVSS project.
+
+    The client mirrors the methods of `HCVSSClient`, but every request is a coroutine sharing one
+    `aiohttp.ClientSession`, so many requests can be in flight over a small pool of sockets.
+    """
+
+    def __init__(self, vault_token: str = "", base_url: str = None, limit: int = 100, limit_per_host: int = 32, max_concurrency: int = 64, timeout: tuple = DEFAULT_TIMEOUT):
+        """
+        Initialize the async HCVSS client. The underlying session is created on first use, since
+        aiohttp requires a running event loop.
+
+        Args:
+            vault_token (str, optional): The Vault token to use. If not provided,
+                will attempt to get from VAULT_TOKEN environment variable.
+            base_url (str, optional): The URL every endpoint path is appended to. If not provided,
+                the HCP app URL of the secrets scanner is used, which requires the HCP_* environment
+                variables to be set.
+            limit (int, optional): The total number of simultaneous connections. Defaults to 100.
+            limit_per_host (int, optional): The number of simultaneous connections to the same
+                host. Defaults to 32.
+            max_concurrency (int, optional): The number of requests allowed in flight at once.
+                Further requests wait for a slot instead of queueing inside the connector, so
+                large bulk reads do not time out waiting for a connection. Defaults to 64.
+            timeout (tuple, optional): The (connect, read) timeout of every request, in seconds.
+                Defaults to (3.05, 10).
+        """
+        self.vault_token = vault_token or os.environ.get("VAULT_TOKEN")
+        self.headers = {"X-Vault-Token": self.vault_token}
+        self._base = (base_url or self.secrets_scanner.base_url).rstrip("/")
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._max_concurrency = max_concurrency
+        self._timeout = aiohttp.ClientTimeout(sock_connect=timeout[0], sock_read=timeout[1])
+        self._session = None
+        self._semaphore = None
+
+    @functools.cached_property
+    def secrets_scanner(self):
+        """The secrets scanner, created on first access."""
+        from .hcvss import SecretsScanner
+
+        return SecretsScanner()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """Close the underlying HTTP session and release its pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        self._semaphore = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self._limit, limit_per_host=self._limit_per_host, ttl_dns_cache=300)
+            headers = {name: value for name, value in self.headers.items() if value is not None}
+            headers["Content-Type"] = "application/json"
+            self._session = aiohttp.ClientSession(connector=connector, headers=headers, timeout=self._timeout)
+        return self._session
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self._semaphore
+
+    async def _request(self, method: str, url: str, json=None):
+        data = None if json is None else _dumps(json)
+        async with self._get_semaphore():
+            async with self._get_session().request(method, url, data=data) as response:
+                content = await response.read()
+        return _loads(content) if content else None
+
+    async def configure_kv_engine(self, secret_mount_path: str, max_versions: int = 0, cas_required: bool = False, delete_version_after: str = "0s"):
+        """Configures backend level settings. See `HCVSSClient.configure_kv_engine`."""
+        url = self._base + "/" + secret_mount_path + "/config"
+        data = {
+            "max_versions": max_versions,
+            "cas_required": cas_required,
+            "delete_version_after": delete_version_after
+        }
+        await self._request("POST", url, json=data)
+
+    async def read_kv_engine_config(self, secret_mount_path: str):
+        """Retrieves the secrets backend configuration. See `HCVSSClient.read_kv_engine_config`."""
+        url = self._base + "/" + secret_mount_path + "/config"
+        return await self._request("GET", url)
+
+    async def read_secret_version(self, secret_mount_path: str, path: str, version: int = 0):
+        """Retrieves the secret at the specified location. See `HCVSSClient.read_secret_version`."""
+        url = self._base + "/" + secret_mount_path + "/data/" + path
+        if version:
+            url += "?" + urlencode({"version": version})
+        return await self._request("GET", url)
+
+    async def read_secrets_bulk(self, secret_mount_path: str, paths: list, versions: list = None):
+        """
+        Reads several secrets concurrently by pipelining their requests on the shared session.
+
+        Args:
+            secret_mount_path (str): The path where the KV secrets engine is mounted.
+            paths (list): The paths of the secrets to read.
+            versions (list, optional): The version to read for each path, in the same order as
+                `paths`. If not set, the latest version of every secret is returned.
+
+        Returns:
+            dict: The response for each secret, keyed by path.
+
+        Raises:
+            ValueError: If `versions` and `paths` differ in length.
+        """
+        if versions is not None and len(versions) != len(paths):
+            raise ValueError("versions must have one entry per path")
+        versions = versions or [0] * len(paths)
+        results = await asyncio.gather(*[
+            self.read_secret_version(secret_mount_path, path, version or 0)
+            for path, version in zip(paths, versions)
+        ])
+        return dict(zip(paths, results))
+
+    async def create_secret(self, secret_mount_path: str, path: str, cas: int, data: dict):
+        """Creates a new version of a secret. See `HCVSSClient.create_secret`."""
+        url = self._base + "/" + secret_mount_path + "/data/" + path
+        options = {"cas": cas}
+        payload = {"options": options, "data": data}
+        return await self._request("POST", url, json=payload)
+
+    async def patch_secret(self, secret_mount_path: str, path: str, options: dict, cas: int, data: dict):
+        """Patches an existing secret. See `HCVSSClient.patch_secret`."""
+        url = self._base + "/" + secret_mount_path + "/data/" + path
+        return await self._request("PATCH", url, json=data)
+
+    async def read_secret_subkeys(self, secret_mount_path: str, path: str, version: int = 0, depth: int = 0):
+        """Provides the subkeys within a secret entry. See `HCVSSClient.read_secret_subkeys`."""
+        url = self._base + "/" + secret_mount_path + "/subkeys/" + path
+        return await self._request("GET", url)
+
+    async def delete_secret(self, secret_mount_path: str, path: str):
+        """Soft deletes the latest version of a secret. See `HCVSSClient.delete_secret`."""
+        url = self._base + "/" + secret_mount_path + "/data/" + path
+        return await self._request("DELETE", url)
+
+    async def delete_secret_versions(self, secret_mount_path: str, path: str, versions: list):
+        """Soft deletes the specified versions of a secret. See `HCVSSClient.delete_secret_versions`."""
+        url = self._base + "/" + secret_mount_path + "/delete/" + path
+        return await self._request("POST", url, json={"versions": versions})
+
+    async def undelete_secret_versions(self, secret_mount_path: str, path: str, versions: list):
+        """Undeletes the specified versions of a secret. See `HCVSSClient.undelete_secret_versions`."""
+        url = self._base + "/" + secret_mount_path + "/undelete/" + path
+        return await self._request("POST", url, json={"versions": versions})
+
+    async def destroy_secret_versions(self, secret_mount_path: str, path: str, versions: list):
+        """Permanently removes the specified versions of a secret. See `HCVSSClient.destroy_secret_versions`."""
+        url = self._base + "/" + secret_mount_path + "/destroy/" + path
+        return await self._request("POST", url, json={"versions": versions})
+
+    async def list_secrets(self, secret_mount_path: str, path: str):
+        """Returns the key names at the specified location. See `HCVSSClient.list_secrets`."""
+        url = self._base + "/" + secret_mount_path + "/metadata/" + path + "?list=true"
+        return await self._request("GET", url)
+
+    async def list_all_secrets_recursive(self, secret_mount_path: str, path: str = ""):
+        """
+        Walks the folder tree below the specified location, listing each level concurrently.
+
+        Args:
+            secret_mount_path (str): The path where the KV secrets engine is mounted.
+            path (str, optional): The folder to start from. Defaults to the root of the mount.
+
+        Returns:
+            list: The full paths of all secrets below `path`.
+        """
+        if path and not path.endswith("/"):
+            path += "/"
+        secrets = []
+        folders = [path]
+        while folders:
+            listings = await asyncio.gather(*[self.list_secrets(secret_mount_path, folder) for folder in folders])
+            next_folders = []
+            for folder, listing in zip(folders, listings):
+                for key in (listing.get("data") or {}).get("keys", []):
+                    (next_folders if key.endswith("/") else secrets).append(folder + key)
+            folders = next_folders
+        return secrets
+
+    async def read_secret_metadata(self, secret_mount_path: str, path: str):
+        """Retrieves the metadata and versions of a secret. See `HCVSSClient.read_secret_metadata`."""
+        url = self._base + "/" + secret_mount_path + "/metadata/" + path
+        return await self._request("GET", url)
+
+    async def update_secret_metadata(self, secret_mount_path: str, path: str, max_versions: int = 0, cas_required: bool = False, delete_version_after: str = "0s", custom_metadata: dict = None):
+        """Updates the metadata of a secret. See `HCVSSClient.update_secret_metadata`."""
+        url = self._base + "/" + secret_mount_path + "/metadata/" + path
+        data = {
+            "max_versions": max_versions,
+            "cas_required": cas_required,
+            "delete_version_after": delete_version_after,
+            "custom_metadata": custom_metadata
+        }
+        return await self._request("POST", url, json=data)
+
+    async def patch_secret_metadata(self, secret_mount_path: str, path: str, max_versions: int = 0, cas_required: bool = False, delete_version_after: str = "0s", custom_metadata: dict = None):
+        """Patches the metadata of a secret. See `HCVSSClient.patch_secret_metadata`."""
+        url = self._base + "/" + secret_mount_path + "/metadata/" + path
+        data = {
+            "max_versions": max_versions,
+            "cas_required": cas_required,
+            "delete_version_after": delete_version_after,
+            "custom_metadata": custom_metadata
+        }
+        return await self._request("PATCH", url, json=data)
+
+    async def delete_secret_metadata_and_all_versions(self, secret_mount_path: str, path: str):
+        """Permanently deletes a secret and all its versions. See `HCVSSClient.delete_secret_metadata_and_all_versions`."""
+        url = self._base + "/" + secret_mount_path + "/metadata/" + path
+        return await self._request("DELETE", url)
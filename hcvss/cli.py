@@ -1,15 +1,23 @@
 """This module provides the Hashivault Secrets Scanner CLI."""
 
+import functools
 from typing import Optional
 
 import typer
 
 from hcvss import __app_name__, __version__
-from .hcvss import SecretsScanner
 
 app = typer.Typer()
 
 
+@functools.lru_cache(maxsize=1)
+def _scanner():
+    """Return the secrets scanner shared by the commands, creating it on first use."""
+    from .hcvss import SecretsScanner
+
+    return SecretsScanner()
+
+
 @app.command()
 def check(
     filename: str = typer.Option(
@@ -17,11 +25,21 @@ def check(
         "--file",
         "-f",
         help="The secrets file to check"
+    ),
+    remote: bool = typer.Option(
+        False,
+        "--remote",
+        help="Fetch the secrets from HCP and check them without writing them to disk"
     )
 ) -> None:
-    """Check the secrets in the file."""
-    hcvss = SecretsScanner()
-    hcvss.check_secrets(filename)
+    """Check the secrets in the file, or in HCP with --remote."""
+    scanner = _scanner()
+    if remote:
+        messages = scanner.check_secrets(data=scanner.fetch_hcp_secrets())
+    else:
+        messages = scanner.check_secrets(filename)
+    if messages:
+        typer.echo("\n".join(messages), err=True)
 
 
 @app.command()
@@ -34,8 +52,7 @@ def fetch(
     )
 ) -> None:
     """Fetch the secrets from HCP."""
-    hcvss = SecretsScanner()
-    hcvss.fetch_hcp_secrets(filename)
+    _scanner().fetch_hcp_secrets(filename)
 
 
 def _version_callback(value: bool) -> None:
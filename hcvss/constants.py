@@ -2,6 +2,18 @@
 Constants for the HCVSS project.
 """
 
+# Secrets this many characters long or shorter are reported as too short
+SECRET_LENGTH = 20
+
+# Timeouts, in seconds, of the HCP token and secrets requests
+HCP_TOKEN_TIMEOUT = 10
+HCP_SECRETS_TIMEOUT = 30
+
+# The URL of an HCP Vault Secrets app, filled in from the HCP_* environment variables
+HCP_APP_URL_TEMPLATE = (
+    "https://api.cloud.hashicorp.com/secrets/2023-11-28"
+    "/organizations/{organization_id}/projects/{project_id}/apps/{app_name}"
+)
 HCP_API_BASE_URL = "https://api.cloud.hashicorp.com/secrets/2023-11-28/organizations/0cf0027f-5b19-4671-9cfa-bf3a9a84bafb/projects/"
 
 # HTTP methods
@@ -20,9 +32,11 @@ HTTP_NOT_FOUND = 404
 HTTP_UNSUPPORTED_OPERATION = 405
 HTTP_PRECONDITION_FAILED = 412
 HTTP_STANDBY_NODE_HEALTH = 429
+HTTP_TOO_MANY_REQUESTS = 429
 HTTP_DR_MODE = 472
 HTTP_PERFORMANCE_HEALTH = 473
 HTTP_INTERNAL_SERVER_ERROR = 500
 HTTP_VAULT_UNINITIALIZED = 501
 HTTP_THIRD_PARTY_ERROR = 502
 HTTP_SERVICE_UNAVAILABLE = 503
+HTTP_GATEWAY_TIMEOUT = 504
@@ -1,89 +1,296 @@
 """This module provides the Hashivault Secrets Scanner model-controller."""
 
+import asyncio
+import concurrent.futures
+import itertools
 import json
+import mmap
 import os
-import subprocess
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ._json import loads as _loads
+from .constants import HCP_APP_URL_TEMPLATE, HCP_SECRETS_TIMEOUT, HCP_TOKEN_TIMEOUT, SECRET_LENGTH
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# ijson reports malformed documents with its own exception type. ValueError also covers empty
+# files, which cannot be memory-mapped.
+_JSON_ERRORS = (ValueError, ijson.JSONError) if ijson else (ValueError,)
+
+# Stands in for a missing static_version, so the lookup does not allocate a dict per secret.
+# It is shared and must never be modified.
+_NO_STATIC_VERSION = {}
+
+# Below this many secrets, check_secrets_parallel filters in-process rather than starting workers
+PARALLEL_THRESHOLD = 10_000
+
+
+def _filter_chunk(secrets, limit: int) -> list:
+    """
+    Get a message for every secret that is too short. Defined at module level so that it can be
+    sent to worker processes.
+
+    Args:
+        secrets (iterable): The secret values to check.
+        limit (int): The length at or below which a secret is too short.
+
+    Returns:
+        list: A message for every secret that is too short.
+    """
+    return [
+        f"Secret {secret} is too short: {length} characters"
+        for secret in secrets
+        if (length := len(secret)) <= limit
+    ]
 
 
 class SecretsScanner:
     """A class to handle scanning and validation of HashiCorp secrets."""
 
+    __slots__ = (
+        "secret_length", "session", "_base_url", "_secrets_url", "_client_id", "_client_secret", "_hcp_token",
+        "_hcp_token_client_id", "_hcp_token_exp", "_hcp_token_lock"
+    )
+
     def __init__(self):
-        """Initialize the SecretsScanner."""
-        self.secret_length = 20
+        """
+        Initialize the SecretsScanner. The HCP environment variables are only checked once the
+        HCP app URL is needed, so checking a local secrets file works without them. The HCP client
+        credentials are read once, here.
+        """
+        self.secret_length = SECRET_LENGTH
+        self._base_url = None
+        self._secrets_url = None
+        self._client_id = os.environ.get('HCP_CLIENT_ID')
+        self._client_secret = os.environ.get('HCP_CLIENT_SECRET')
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+        self._hcp_token = None
+        self._hcp_token_client_id = None
+        self._hcp_token_exp = 0
+        self._hcp_token_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        """The URL of the HCP app, built from the environment on first access."""
+        if self._base_url is None:
+            self._base_url = self._validate_env()
+        return self._base_url
+
+    def _validate_env(self) -> str:
+        """
+        Check the required environment variables and build the HCP app URL from them.
+
+        Returns:
+            str: The URL of the HCP app.
 
-        # Check for required environment variables
+        Raises:
+            EnvironmentError: If any of the required environment variables is missing.
+        """
+        # Check for required environment variables, reading each of them once
         required_vars = ['HCP_ORGANIZATION_ID', 'HCP_PROJECT_ID', 'HCP_APP_NAME']
-        missing_vars = [var for var in required_vars if not os.environ.get(var)]
+        env = {var: os.environ.get(var) for var in required_vars}
+        missing_vars = [var for var, value in env.items() if not value]
 
         if missing_vars:
             raise EnvironmentError(
                 f"Missing required environment variables: {', '.join(missing_vars)}"
             )
 
-        self.base_url = (
-            "https://api.cloud.hashicorp.com/secrets/2023-11-28"
-            f"/organizations/{os.environ['HCP_ORGANIZATION_ID']}"
-            f"/projects/{os.environ['HCP_PROJECT_ID']}"
-            f"/apps/{os.environ['HCP_APP_NAME']}"
+        return HCP_APP_URL_TEMPLATE.format(
+            organization_id=env['HCP_ORGANIZATION_ID'],
+            project_id=env['HCP_PROJECT_ID'],
+            app_name=env['HCP_APP_NAME']
         )
 
-    def check_secrets(self, filename: str):
-        """Check the secrets in the given file."""
-        secrets = self._get_secret_values(filename)
+    def check_secrets(self, filename: str = None, client=None, secret_mount_path: str = "secret", paths: list = None, data: dict = None):
+        """
+        Check the secrets in the given file, in Vault when `paths` is given, or in an already
+        parsed document when `data` is given.
 
-        messages = []
+        Args:
+            filename (str, optional): Path to the JSON file containing secrets data.
+            client (HCVSSClient, optional): The client used to read `paths` from Vault.
+            secret_mount_path (str, optional): The path where the KV secrets engine is mounted.
+                Defaults to "secret".
+            paths (list, optional): The Vault secrets to check. They are fetched concurrently
+                instead of one request after another.
+            data (dict, optional): A secrets document as returned by `fetch_hcp_secrets`, checked
+                without writing it to disk and reading it back.
 
-        for secret in secrets:
-            if len(secret) <= self.secret_length:
-                message = f"Secret {secret} is too short: {len(secret)} characters"
-                messages.append(message)
-                print(message)
+        Returns:
+            list: A message for every secret that is too short.
+        """
+        if paths:
+            secrets = self._get_vault_secret_values(client, secret_mount_path, paths)
+        elif data is not None:
+            secrets = self._extract_secret_values(data)
+        else:
+            secrets = self._iter_secret_values(filename)
+
+        messages = _filter_chunk(secrets, self.secret_length)
+
+        return messages
+
+    def check_secrets_parallel(self, filename: str, workers: int = None):
+        """
+        Check the secrets in the given file, sharding them across worker processes. Files with no
+        more than `PARALLEL_THRESHOLD` secrets are checked in-process, since starting the workers
+        would cost more than the check itself.
+
+        Args:
+            filename (str): Path to the JSON file containing secrets data.
+            workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+
+        Returns:
+            list: A message for every secret that is too short, in the order of the file.
+        """
+        secrets = list(self._iter_secret_values(filename))
+
+        if len(secrets) <= PARALLEL_THRESHOLD:
+            messages = _filter_chunk(secrets, self.secret_length)
+        else:
+            workers = workers or os.cpu_count() or 1
+            size = -(-len(secrets) // workers)
+            chunks = [secrets[i:i + size] for i in range(0, len(secrets), size)]
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(_filter_chunk, chunks, itertools.repeat(self.secret_length))
+                messages = [message for result in results for message in result]
 
         return messages
 
-    def fetch_hcp_secrets(self, filename: str = "test_secrets.json") -> dict:
+    def fetch_hcp_secrets(self, filename: str = None) -> dict:
         """
         Fetch secrets from HCP using the provided token.
 
+        Args:
+            filename (str, optional): The file the response is streamed to. If not set, nothing
+                is written to disk.
+
         Returns:
             dict: A dictionary containing the JSON response from HCP.
 
         Raises:
-            subprocess.CalledProcessError: If the curl or jq command fails.
+            requests.RequestException: If the request fails.
             json.JSONDecodeError: If the response isn't valid JSON.
         """
-        # Construct the curl command
-        token = self._generate_hcp_api_token(os.environ.get('HCP_CLIENT_ID'), os.environ.get('HCP_CLIENT_SECRET'))
-        url = self.base_url + "/secrets:open"
-        cmd = [
-            'curl',
-            '--location', url,
-            '--request', 'GET',
-            '--header', f"Authorization: Bearer {token}"
-        ]
+        # The token is also set as the session's Authorization header
+        self._generate_hcp_api_token(self._client_id, self._client_secret)
+        if self._secrets_url is None:
+            self._secrets_url = self.base_url + "/secrets:open"
 
         try:
-            # Execute the curl command and capture its output
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            # Use jq to format the JSON output (assuming jq is installed)
-            jq_cmd = ['jq']
-            json_output = subprocess.run(jq_cmd, input=result.stdout, capture_output=True, text=True, check=True).stdout
-            # Parse JSON output, printing only enabled for testing purposes
-            with open(filename, 'w') as f:
-                f.write(json_output)
-            print(json_output)
-            return json.loads(json_output)
-        except subprocess.CalledProcessError as e:
-            print(f"Command failed with error: {e.stderr}")
+            with self.session.get(self._secrets_url, stream=True, timeout=HCP_SECRETS_TIMEOUT) as response:
+                response.raise_for_status()
+                if filename:
+                    # Stream the body to disk instead of holding it in memory alongside the file
+                    with open(filename, 'wb') as f:
+                        for chunk in response.iter_content(chunk_size=65536):
+                            f.write(chunk)
+                    with open(filename, 'rb') as f:
+                        content = f.read()
+                else:
+                    content = response.content
+            secrets = _loads(content)
+        except requests.RequestException as e:
+            print(f"Request failed with error: {e}")
             raise
         except json.JSONDecodeError as e:
             print(f"Failed to decode JSON: {e}")
             raise
 
+        return secrets
+
+    async def fetch_hcp_secrets_async(self, apps: list = None, limit: int = 20) -> dict:
+        """
+        Fetch the secrets of several HCP apps of the project concurrently. Requires the `async`
+        extra.
+
+        Args:
+            apps (list, optional): The names of the apps to fetch. Defaults to the app named by
+                HCP_APP_NAME.
+            limit (int, optional): The number of simultaneous connections. Defaults to 20.
+
+        Returns:
+            dict: The JSON response from HCP for each app, keyed by app name.
+
+        Raises:
+            aiohttp.ClientError: If a request fails.
+            json.JSONDecodeError: If a response isn't valid JSON.
+        """
+        import aiohttp
+
+        urls = self._app_secrets_urls(apps)
+        # The token cache is shared with the synchronous methods, so it is generated in a thread
+        token = await asyncio.to_thread(self._generate_hcp_api_token, self._client_id, self._client_secret)
+
+        async def fetch(session, url):
+            async with session.get(url) as response:
+                response.raise_for_status()
+                return _loads(await response.read())
+
+        async with aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=limit),
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=aiohttp.ClientTimeout(total=HCP_SECRETS_TIMEOUT)
+        ) as session:
+            results = await asyncio.gather(*[fetch(session, url) for url in urls.values()])
+        return dict(zip(urls, results))
+
+    def fetch_hcp_secrets_for_apps(self, apps: list = None, max_workers: int = 16) -> dict:
+        """
+        Fetch the secrets of several HCP apps of the project concurrently from a pool of threads
+        sharing the scanner's session.
+
+        Args:
+            apps (list, optional): The names of the apps to fetch. Defaults to the app named by
+                HCP_APP_NAME.
+            max_workers (int, optional): The maximum number of requests in flight. Defaults to 16.
+
+        Returns:
+            dict: The JSON response from HCP for each app, keyed by app name.
+
+        Raises:
+            requests.RequestException: If a request fails.
+            json.JSONDecodeError: If a response isn't valid JSON.
+        """
+        urls = self._app_secrets_urls(apps)
+        # The token is also set as the session's Authorization header
+        self._generate_hcp_api_token(self._client_id, self._client_secret)
+
+        def fetch(url):
+            response = self.session.get(url, timeout=HCP_SECRETS_TIMEOUT)
+            response.raise_for_status()
+            return _loads(response.content)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+            results = list(executor.map(fetch, urls.values()))
+        return dict(zip(urls, results))
+
+    def _app_secrets_urls(self, apps: list = None) -> dict:
+        """
+        Get the secrets:open URL of each of the given apps of the project.
+
+        Args:
+            apps (list, optional): The names of the apps. Defaults to the app named by HCP_APP_NAME.
+
+        Returns:
+            dict: The URL of each app, keyed by app name.
+        """
+        project_url, _, app_name = self.base_url.rpartition("/apps/")
+        return {app: project_url + "/apps/" + app + "/secrets:open" for app in apps or [app_name]}
+
     def _generate_hcp_api_token(self, client_id: str, client_secret: str) -> str:
         """
-        Generate an HCP API token using client credentials.
+        Generate an HCP API token using client credentials. The token is reused until a minute
+        before it expires, and is set as the Authorization header of the session.
 
         Args:
             client_id (str): The client ID for authentication.
@@ -93,57 +300,107 @@ class SecretsScanner:
             str: The generated HCP API token.
 
         Raises:
-            subprocess.CalledProcessError: If the curl command fails.
+            requests.RequestException: If the request fails.
             ValueError: If the response doesn't contain an access token.
         """
-        cmd = [
-            'curl', '--location', 'https://auth.idp.hashicorp.com/oauth2/token',
-            '--header', 'Content-Type: application/x-www-form-urlencoded',
-            '--data-urlencode', f'client_id={client_id}',
-            '--data-urlencode', f'client_secret={client_secret}',
-            '--data-urlencode', 'grant_type=client_credentials',
-            '--data-urlencode', 'audience=https://api.hashicorp.cloud'
-        ]
+        with self._hcp_token_lock:
+            if self._hcp_token_client_id == client_id and time.monotonic() < self._hcp_token_exp - 60:
+                return self._hcp_token
 
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            json_output = result.stdout.strip()
-            jq_cmd = ['jq', '-r', '.access_token']
-            token_result = subprocess.run(jq_cmd, input=json_output, capture_output=True, text=True, check=True)
-
-            token = token_result.stdout.strip()
-            if not token:
-                raise ValueError("No access token found in the response.")
+            data = {
+                'client_id': client_id,
+                'client_secret': client_secret,
+                'grant_type': 'client_credentials',
+                'audience': 'https://api.hashicorp.cloud'
+            }
+            try:
+                response = self.session.post(
+                    'https://auth.idp.hashicorp.com/oauth2/token',
+                    data=data,
+                    # Never send the previous token to the identity provider
+                    headers={"Authorization": None},
+                    timeout=HCP_TOKEN_TIMEOUT
+                )
+                response.raise_for_status()
+                token_response = _loads(response.content)
+                token = token_response.get('access_token')
+                if not token:
+                    raise ValueError("No access token found in the response.")
+            except requests.RequestException as e:
+                print(f"Request failed with error: {e}")
+                raise
+            except Exception as e:
+                print(f"An unexpected error occurred: {e}")
+                raise
+
+            self._hcp_token = token
+            self._hcp_token_client_id = client_id
+            self._hcp_token_exp = time.monotonic() + token_response.get('expires_in', 0)
+            self.session.headers["Authorization"] = f"Bearer {token}"
             return token
-        except subprocess.CalledProcessError as e:
-            print(f"Command failed with error: {e.stderr}")
-            raise
-        except Exception as e:
-            print(f"An unexpected error occurred: {e}")
-            raise
 
-    def _get_secret_values(self, file_path):
+    def _get_vault_secret_values(self, client, secret_mount_path: str, paths: list) -> list:
         """
-        Get the value from each secret in the JSON data.
+        Get the value of every key of the given KV v2 secrets.
 
         Args:
-            file_path: Path to the JSON file containing secrets data.
+            client (HCVSSClient): The client used to read the secrets.
+            secret_mount_path (str): The path where the KV secrets engine is mounted.
+            paths (list): The paths of the secrets to read.
 
         Returns:
             list: List of secret values.
         """
+        responses = client.bulk_read_secret_versions(secret_mount_path, paths)
+        values = []
+        for path in paths:
+            secret = ((responses[path] or {}).get('data') or {}).get('data') or {}
+            values.extend(str(value) for value in secret.values())
+        return values
+
+    def _iter_secret_values(self, file_path):
+        """
+        Yield the value of each secret in the JSON data. When ijson is installed the file is
+        parsed incrementally, so only one secret is held in memory at a time. Errors are printed
+        and end the iteration.
+
+        Args:
+            file_path: Path to the JSON file containing secrets data.
+
+        Yields:
+            str: The value of each secret.
+        """
         try:
-            with open(file_path, 'r') as file:
-                data = json.load(file)
+            with open(file_path, 'rb') as file:
+                if ijson is not None:
+                    for secret in ijson.items(file, 'secrets.item'):
+                        yield secret.get('static_version', _NO_STATIC_VERSION).get('value', 'No value found')
+                    return
+                # Map the file rather than reading it, so the parser works on the page cache directly
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                    data = _loads(view)
         except FileNotFoundError:
             print(f"Error: The file {file_path} does not exist.")
-            return []
-        except json.JSONDecodeError:
+            return
+        except _JSON_ERRORS:
             print(f"Error: The file {file_path} does not contain valid JSON.")
-            return []
+            return
         except Exception as e:
             print(f"An unexpected error occurred: {e}")
-            return []
+            return
+
+        yield from self._extract_secret_values(data)
+
+    @staticmethod
+    def _extract_secret_values(data: dict) -> list:
+        """
+        Get the value from each secret of a parsed secrets document.
 
+        Args:
+            data (dict): The secrets document, as returned by HCP.
+
+        Returns:
+            list: List of secret values.
+        """
         secrets = data.get('secrets', [])
-        return [secret.get('static_version', {}).get('value', 'No value found') for secret in secrets]
+        return [secret.get('static_version', _NO_STATIC_VERSION).get('value', 'No value found') for secret in secrets]
@@ -1,39 +1,144 @@
+import concurrent.futures
+import json
+import time
 import pytest
 from unittest.mock import patch, Mock
-from hcvss.api import HCVSSClient
+from hcvss.api import DEFAULT_TIMEOUT, BufferedHCVSSClient, CircuitOpenError, HCVSSClient
+
+BASE_URL = "https://vault.example.com/v1"
 
 @pytest.fixture
 def client():
     """Create a test client with a dummy token"""
-    return HCVSSClient(vault_token="test-token")
+    return HCVSSClient(vault_token="test-token", base_url=BASE_URL)
 
 @pytest.fixture
 def mock_response():
     """Create a mock response object"""
     mock = Mock()
-    mock.json.return_value = {"data": {"foo": "bar"}}
+    mock.status_code = 200
+    mock.content = b'{"data": {"foo": "bar"}}'
     return mock
 
 def test_init_with_token():
     """Test client initialization with explicit token"""
-    client = HCVSSClient(vault_token="test-token")
+    client = HCVSSClient(vault_token="test-token", base_url=BASE_URL)
     assert client.vault_token == "test-token"
     assert client.headers == {"X-Vault-Token": "test-token"}
+    assert client.session.headers["X-Vault-Token"] == "test-token"
 
 @patch.dict('os.environ', {'VAULT_TOKEN': 'env-token'})
 def test_init_with_env_token():
     """Test client initialization with environment token"""
-    client = HCVSSClient()
+    client = HCVSSClient(base_url=BASE_URL)
     assert client.vault_token == "env-token"
     assert client.headers == {"X-Vault-Token": "env-token"}
 
+def test_init_does_not_build_scanner_with_base_url():
+    """Test an explicit base URL leaves the secrets scanner unbuilt"""
+    client = HCVSSClient(vault_token="test-token", base_url=BASE_URL + "/")
+    assert client._base == BASE_URL
+    assert client._secrets_scanner is None
+
+@patch.dict('os.environ', {
+    'HCP_ORGANIZATION_ID': 'test-org',
+    'HCP_PROJECT_ID': 'test-project',
+    'HCP_APP_NAME': 'test-app'
+})
+def test_init_defaults_to_scanner_base_url():
+    """Test the base URL falls back to the secrets scanner's HCP app URL"""
+    client = HCVSSClient(vault_token="test-token")
+    assert client._base == client.secrets_scanner.base_url
+
+def test_init_mounts_pooled_adapter():
+    """Test the session uses a pooled, retrying adapter"""
+    client = HCVSSClient(vault_token="test-token", base_url=BASE_URL, pool_maxsize=8)
+    adapter = client.session.get_adapter("https://vault.example.com")
+    assert adapter._pool_maxsize == 8
+    assert adapter.max_retries.total == 3
+    assert 503 in adapter.max_retries.status_forcelist
+    assert adapter.max_retries.allowed_methods == frozenset(["GET", "DELETE"])
+    assert adapter.max_retries.raise_on_status is False
+
+def test_init_with_httpx_transport():
+    """Test the httpx transport builds an HTTP/2 client"""
+    httpx = pytest.importorskip("httpx")
+    pytest.importorskip("h2")
+    client = HCVSSClient(vault_token="test-token", base_url=BASE_URL, transport="httpx")
+    assert isinstance(client.session, httpx.Client)
+    assert client.session.headers["X-Vault-Token"] == "test-token"
+    assert (client.session.timeout.connect, client.session.timeout.read) == DEFAULT_TIMEOUT
+    assert client.session._transport._pool._http2 is True
+    client.close()
+
+def test_httpx_transport_sends_json_body():
+    """Test a write through the httpx transport sends the encoded body"""
+    httpx = pytest.importorskip("httpx")
+    pytest.importorskip("h2")
+    sent = []
+
+    def handle_request(transport, request):
+        sent.append(request)
+        return httpx.Response(200, json={"data": {"version": 1}})
+
+    with patch('httpx.HTTPTransport.handle_request', handle_request):
+        with HCVSSClient(vault_token="test-token", base_url=BASE_URL, transport="httpx") as client:
+            result = client.create_secret("secret", "my-secret", cas=0, data={"password": "secret123"})
+
+    assert result == {"data": {"version": 1}}
+    request = sent[0]
+    assert (request.method, str(request.url)) == ("POST", f"{BASE_URL}/secret/data/my-secret")
+    assert request.headers["X-Vault-Token"] == "test-token"
+    assert json.loads(request.content) == {"options": {"cas": 0}, "data": {"password": "secret123"}}
+
+def test_init_with_unknown_transport():
+    """Test an unsupported transport is rejected"""
+    with pytest.raises(ValueError):
+        HCVSSClient(vault_token="test-token", base_url=BASE_URL, transport="curl")
+
+@patch('requests.Session.close')
+def test_context_manager_closes_session(mock_close):
+    """Test the session is closed when leaving the client context"""
+    with HCVSSClient(vault_token="test-token", base_url=BASE_URL) as client:
+        assert isinstance(client, HCVSSClient)
+    mock_close.assert_called_once()
+
+@patch('requests.Session.request')
+def test_circuit_opens_after_repeated_failures(mock_request, client):
+    """Test requests are refused after five failures in a row until the reset period passes"""
+    mock_request.return_value = Mock(status_code=503, content=b'{"errors": []}')
+
+    with patch('time.monotonic', return_value=100):
+        for _ in range(5):
+            client.delete_secret("secret", "s")
+        with pytest.raises(CircuitOpenError):
+            client.delete_secret("secret", "s")
+    assert mock_request.call_count == 5
+
+    mock_request.return_value = Mock(status_code=204, content=b"")
+    with patch('time.monotonic', return_value=131):
+        assert client.delete_secret("secret", "s") is None
+        assert client.delete_secret("secret", "s") is None
+    assert mock_request.call_count == 7
+
+@patch('requests.Session.request')
+def test_transport_errors_count_as_failures(mock_request, client):
+    """Test exceptions raised by the session trip the circuit"""
+    mock_request.side_effect = ConnectionError("refused")
+
+    for _ in range(5):
+        with pytest.raises(ConnectionError):
+            client.delete_secret("secret", "s")
+    with pytest.raises(CircuitOpenError):
+        client.delete_secret("secret", "s")
+
 class TestSecretOperations:
     """Group tests for secret operations"""
 
-    @patch('requests.post')
-    def test_create_secret(self, mock_post, client, mock_response):
+    @patch('requests.Session.request')
+    def test_create_secret(self, mock_request, client, mock_response):
         """Test creating a secret"""
-        mock_post.return_value = mock_response
+        mock_request.return_value = mock_response
 
         result = client.create_secret(
             secret_mount_path="secret",
@@ -42,17 +147,19 @@ class TestSecretOperations:
             data={"password": "secret123"}
         )
 
-        mock_post.assert_called_once_with(
-            f"{client.secrets_scanner.base_url}/secret/data/my-secret",
-            headers=client.headers,
-            json={"password": "secret123"}
-        )
+        mock_request.assert_called_once()
+        method, url = mock_request.call_args.args
+        assert (method, url) == ("POST", f"{BASE_URL}/secret/data/my-secret")
+        assert json.loads(mock_request.call_args.kwargs["data"]) == {
+            "options": {"cas": 0},
+            "data": {"password": "secret123"}
+        }
         assert result == {"data": {"foo": "bar"}}
 
-    @patch('requests.get')
-    def test_read_secret_version(self, mock_get, client, mock_response):
+    @patch('requests.Session.request')
+    def test_read_secret_version(self, mock_request, client, mock_response):
         """Test reading a secret version"""
-        mock_get.return_value = mock_response
+        mock_request.return_value = mock_response
 
         result = client.read_secret_version(
             secret_mount_path="secret",
@@ -60,51 +167,70 @@ class TestSecretOperations:
             version=1
         )
 
-        mock_get.assert_called_once_with(
-            f"{client.secrets_scanner.base_url}/secret/data/my-secret?version=1",
-            headers=client.headers
+        mock_request.assert_called_once_with(
+            "GET",
+            f"{BASE_URL}/secret/data/my-secret?version=1",
+            timeout=DEFAULT_TIMEOUT
         )
         assert result == {"data": {"foo": "bar"}}
 
-    @patch('requests.delete')
-    def test_delete_secret(self, mock_delete, client, mock_response):
+    @patch('requests.Session.request')
+    def test_read_secret_latest_version(self, mock_request, client, mock_response):
+        """Test reading the latest version omits the version query"""
+        mock_request.return_value = mock_response
+
+        client.read_secret_version(secret_mount_path="secret", path="my-secret")
+
+        mock_request.assert_called_once_with("GET", f"{BASE_URL}/secret/data/my-secret", timeout=DEFAULT_TIMEOUT)
+
+    @patch('requests.Session.request')
+    def test_delete_secret(self, mock_request, client, mock_response):
         """Test deleting a secret"""
-        mock_delete.return_value = mock_response
+        mock_request.return_value = mock_response
 
         result = client.delete_secret(
             secret_mount_path="secret",
             path="my-secret"
         )
 
-        mock_delete.assert_called_once_with(
-            f"{client.secrets_scanner.base_url}/secret/data/my-secret",
-            headers=client.headers
+        mock_request.assert_called_once_with(
+            "DELETE",
+            f"{BASE_URL}/secret/data/my-secret",
+            timeout=DEFAULT_TIMEOUT
         )
         assert result == {"data": {"foo": "bar"}}
 
+    @patch('requests.Session.request')
+    def test_delete_secret_no_content(self, mock_request, client):
+        """Test an empty 204 response decodes to None"""
+        mock_request.return_value = Mock(status_code=204, content=b"")
+
+        assert client.delete_secret(secret_mount_path="secret", path="my-secret") is None
+
 class TestMetadataOperations:
     """Group tests for metadata operations"""
 
-    @patch('requests.get')
-    def test_read_secret_metadata(self, mock_get, client, mock_response):
+    @patch('requests.Session.request')
+    def test_read_secret_metadata(self, mock_request, client, mock_response):
         """Test reading secret metadata"""
-        mock_get.return_value = mock_response
+        mock_request.return_value = mock_response
 
         result = client.read_secret_metadata(
             secret_mount_path="secret",
             path="my-secret"
         )
 
-        mock_get.assert_called_once_with(
-            f"{client.secrets_scanner.base_url}/secret/metadata/my-secret",
-            headers=client.headers
+        mock_request.assert_called_once_with(
+            "GET",
+            f"{BASE_URL}/secret/metadata/my-secret",
+            timeout=DEFAULT_TIMEOUT
         )
         assert result == {"data": {"foo": "bar"}}
 
-    @patch('requests.post')
-    def test_update_secret_metadata(self, mock_post, client, mock_response):
+    @patch('requests.Session.request')
+    def test_update_secret_metadata(self, mock_request, client, mock_response):
         """Test updating secret metadata"""
-        mock_post.return_value = mock_response
+        mock_request.return_value = mock_response
 
         result = client.update_secret_metadata(
             secret_mount_path="secret",
@@ -114,5 +240,238 @@ class TestMetadataOperations:
             custom_metadata={"owner": "team-a"}
         )
 
-        mock_post.assert_called_once()
-        assert result == {"data": {"foo": "bar"}}
\ No newline at end of file
+        mock_request.assert_called_once()
+        assert result == {"data": {"foo": "bar"}}
+
+class TestReadCache:
+    """Group tests for the metadata read cache"""
+
+    @patch('requests.Session.request')
+    def test_repeated_reads_are_cached(self, mock_request, client, mock_response):
+        """Test repeated metadata reads hit Vault once"""
+        mock_request.return_value = mock_response
+
+        first = client.read_secret_metadata("secret", "my-secret")
+        second = client.read_secret_metadata("secret", "my-secret")
+
+        assert first == second == {"data": {"foo": "bar"}}
+        mock_request.assert_called_once()
+
+    @patch('requests.Session.request')
+    def test_writes_invalidate_cache(self, mock_request, client, mock_response):
+        """Test a write evicts the secret's metadata and its folder listing"""
+        mock_request.return_value = mock_response
+        client.read_secret_metadata("secret", "app/db")
+        client.list_secrets("secret", "app/")
+        client.list_secrets("other", "app/")
+
+        client.create_secret("secret", "app/db", cas=0, data={})
+        client.read_secret_metadata("secret", "app/db")
+        client.list_secrets("secret", "app/")
+        client.list_secrets("other", "app/")
+
+        methods = [call.args[0] for call in mock_request.call_args_list]
+        assert methods == ["GET", "GET", "GET", "POST", "GET", "GET"]
+
+    @patch('requests.Session.request')
+    def test_secret_versions_are_cached_separately(self, mock_request, client, mock_response):
+        """Test each secret version has its own cache entry"""
+        mock_request.return_value = mock_response
+
+        client.read_secret_version("secret", "my-secret", version=1)
+        client.read_secret_version("secret", "my-secret", version=2)
+        client.read_secret_version("secret", "my-secret", version=1)
+
+        assert mock_request.call_count == 2
+
+    @patch('requests.Session.request')
+    def test_error_responses_are_not_cached(self, mock_request, client):
+        """Test a failed read goes to Vault again on the next call"""
+        mock_request.return_value = Mock(status_code=503, content=b'{"errors": ["sealed"]}')
+
+        assert client.read_secret_metadata("secret", "my-secret") == {"errors": ["sealed"]}
+        client.read_secret_metadata("secret", "my-secret")
+
+        assert mock_request.call_count == 2
+
+    @patch('requests.Session.request')
+    def test_cached_responses_are_copies(self, mock_request, client, mock_response):
+        """Test modifying a returned response does not change the cached one"""
+        mock_request.return_value = mock_response
+
+        client.read_secret_metadata("secret", "my-secret")["data"]["foo"] = "changed"
+
+        assert client.read_secret_metadata("secret", "my-secret") == {"data": {"foo": "bar"}}
+        mock_request.assert_called_once()
+
+    @patch('requests.Session.request')
+    def test_clear_cache(self, mock_request, client, mock_response):
+        """Test clearing the cache forces the next read to Vault"""
+        mock_request.return_value = mock_response
+        client.read_secret_version("secret", "my-secret")
+
+        client.clear_cache()
+        client.read_secret_version("secret", "my-secret")
+
+        assert mock_request.call_count == 2
+
+    @patch('requests.Session.request')
+    def test_configure_kv_engine_invalidates_mount(self, mock_request, client, mock_response):
+        """Test reconfiguring the engine evicts the cached configuration"""
+        mock_request.return_value = mock_response
+        client.read_kv_engine_config("secret")
+
+        client.configure_kv_engine("secret", max_versions=5)
+        client.read_kv_engine_config("secret")
+
+        assert mock_request.call_count == 3
+
+class TestBulkOperations:
+    """Group tests for concurrent bulk operations"""
+
+    @patch('requests.Session.request')
+    def test_read_secrets_bulk(self, mock_request, client):
+        """Test reading several secrets concurrently"""
+        def fake_request(method, url, **kwargs):
+            response = Mock(status_code=200)
+            response.content = json.dumps({"url": url}).encode()
+            return response
+        mock_request.side_effect = fake_request
+
+        result = client.read_secrets_bulk("secret", ["a", "b"], versions=[2, 0])
+
+        assert result == {
+            "a": {"url": f"{BASE_URL}/secret/data/a?version=2"},
+            "b": {"url": f"{BASE_URL}/secret/data/b"},
+        }
+
+    @patch('requests.Session.request')
+    def test_read_secrets_bulk_max_workers(self, mock_request, client, mock_response):
+        """Test the worker count is capped by max_workers and the number of paths"""
+        mock_request.return_value = mock_response
+        with patch('concurrent.futures.ThreadPoolExecutor', wraps=concurrent.futures.ThreadPoolExecutor) as mock_executor:
+            client.read_secrets_bulk("secret", ["a", "b", "c"], max_workers=2)
+            client.read_secrets_bulk("secret", ["d"], max_workers=2)
+
+        assert [call.kwargs["max_workers"] for call in mock_executor.call_args_list] == [2, 1]
+
+    def test_read_secrets_bulk_rejects_mismatched_versions(self, client):
+        """Test a versions list that does not match the paths is rejected"""
+        with pytest.raises(ValueError):
+            client.read_secrets_bulk("secret", ["a", "b", "c"], versions=[1])
+
+    @patch('requests.Session.request')
+    def test_list_secrets_uses_list_query(self, mock_request, client, mock_response):
+        """Test listings ask Vault for keys instead of metadata"""
+        mock_request.return_value = mock_response
+
+        client.list_secrets("secret", "app/")
+        client.read_secret_metadata("secret", "app/")
+
+        urls = [call.args[1] for call in mock_request.call_args_list]
+        assert urls == [f"{BASE_URL}/secret/metadata/app/?list=true", f"{BASE_URL}/secret/metadata/app/"]
+
+    def test_read_secrets_bulk_rejects_zero_workers(self, client):
+        """Test a worker count below one is rejected"""
+        with pytest.raises(ValueError):
+            client.read_secrets_bulk("secret", ["a"], max_workers=0)
+
+    @patch('requests.Session.request')
+    def test_bulk_read_secret_versions(self, mock_request, client, mock_response):
+        """Test bulk reading the latest versions"""
+        mock_request.return_value = mock_response
+
+        result = client.bulk_read_secret_versions("secret", ["a", "b"], max_workers=4)
+
+        assert result == {"a": {"data": {"foo": "bar"}}, "b": {"data": {"foo": "bar"}}}
+
+    def test_read_secrets_bulk_empty(self, client):
+        """Test bulk reading no paths makes no requests"""
+        assert client.read_secrets_bulk("secret", []) == {}
+
+    @patch('requests.Session.request')
+    def test_list_all_secrets_recursive(self, mock_request, client):
+        """Test walking nested folders"""
+        listings = {
+            f"{BASE_URL}/secret/metadata/?list=true": {"data": {"keys": ["app/", "root-key"]}},
+            f"{BASE_URL}/secret/metadata/app/?list=true": {"data": {"keys": ["db", "nested/"]}},
+            f"{BASE_URL}/secret/metadata/app/nested/?list=true": {"data": {"keys": ["deep"]}},
+        }
+        def fake_request(method, url, **kwargs):
+            response = Mock(status_code=200)
+            response.content = json.dumps(listings[url]).encode()
+            return response
+        mock_request.side_effect = fake_request
+
+        result = client.list_all_secrets_recursive("secret")
+
+        assert sorted(result) == ["app/db", "app/nested/deep", "root-key"]
+
+
+class TestBufferedClient:
+    """Group tests for the buffered write client"""
+
+    @patch('requests.Session.request')
+    def test_create_secret_returns_future(self, mock_request, mock_response):
+        """Test queued writes resolve to the response"""
+        mock_request.return_value = mock_response
+
+        with BufferedHCVSSClient(vault_token="test-token", base_url=BASE_URL) as client:
+            futures = [client.create_secret("secret", f"s{i}", cas=0, data={"i": i}) for i in range(5)]
+            results = [future.result(timeout=5) for future in futures]
+
+        assert results == [{"data": {"foo": "bar"}}] * 5
+        assert mock_request.call_count == 5
+
+    @patch('requests.Session.request')
+    def test_write_errors_are_set_on_future(self, mock_request):
+        """Test a failing write surfaces through its future"""
+        mock_request.side_effect = RuntimeError("boom")
+
+        with BufferedHCVSSClient(vault_token="test-token", base_url=BASE_URL) as client:
+            future = client.patch_secret("secret", "s", options={}, cas=1, data={})
+            with pytest.raises(RuntimeError):
+                future.result(timeout=5)
+
+    @patch('requests.Session.request')
+    def test_close_flushes_pending_writes(self, mock_request, mock_response):
+        """Test closing the client completes queued writes"""
+        mock_request.return_value = mock_response
+
+        client = BufferedHCVSSClient(vault_token="test-token", base_url=BASE_URL)
+        future = client.update_secret_metadata("secret", "s", max_versions=3)
+        client.close()
+
+        assert future.done()
+        assert future.result() == {"data": {"foo": "bar"}}
+
+    def test_submit_after_close_raises(self):
+        """Test a write queued on a closed client is rejected"""
+        client = BufferedHCVSSClient(vault_token="test-token", base_url=BASE_URL)
+        client.close()
+
+        with pytest.raises(RuntimeError):
+            client.create_secret("secret", "s", cas=0, data={})
+
+    @patch('requests.Session.request')
+    def test_writes_to_one_secret_keep_their_order(self, mock_request, mock_response):
+        """Test writes to the same secret are issued one at a time in submission order"""
+        in_flight = []
+        order = []
+
+        def request(method, url, data=None, **kwargs):
+            in_flight.append(url)
+            assert in_flight.count(url) == 1
+            time.sleep(0.001)
+            order.append(json.loads(data)["options"]["cas"])
+            in_flight.remove(url)
+            return mock_response
+
+        mock_request.side_effect = request
+
+        with BufferedHCVSSClient(vault_token="test-token", base_url=BASE_URL, workers=4) as client:
+            futures = [client.create_secret("secret", "s", cas=i, data={}) for i in range(10)]
+            for future in futures:
+                future.result(timeout=5)
+
+        assert order == list(range(10))
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import pytest
+from unittest.mock import patch
+
+pytest.importorskip("aiohttp")
+
+from hcvss.async_api import AsyncHCVSSClient
+
+BASE_URL = "https://vault.example.com/v1"
+
+
+class FakeResponse:
+    """A minimal stand-in for an aiohttp response"""
+
+    def __init__(self, payload, session=None):
+        self.payload = payload
+        self.session = session
+
+    async def __aenter__(self):
+        if self.session is not None:
+            self.session.in_flight += 1
+            self.session.max_in_flight = max(self.session.max_in_flight, self.session.in_flight)
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self.session is not None:
+            self.session.in_flight -= 1
+        return False
+
+    async def read(self):
+        return json.dumps(self.payload).encode()
+
+
+class FakeSession:
+    """Records requests and answers them from a url -> payload mapping"""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+        self.closed = False
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def request(self, method, url, data=None):
+        self.calls.append((method, url, None if data is None else json.loads(data)))
+        return FakeResponse(self.responses.get(url, {"data": {"foo": "bar"}}), self)
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def client():
+    """Create a test client backed by a fake session"""
+    client = AsyncHCVSSClient(vault_token="test-token", base_url=BASE_URL)
+    client._session = FakeSession({})
+    return client
+
+def test_session_omits_missing_token():
+    """Test a missing token is left out of the session headers"""
+    client = AsyncHCVSSClient(base_url=BASE_URL)
+    client.vault_token = None
+    client.headers = {"X-Vault-Token": None}
+
+    async def build_session():
+        session = client._get_session()
+        headers = dict(session.headers)
+        assert (session.timeout.sock_connect, session.timeout.sock_read) == (3.05, 10)
+        await client.close()
+        return headers
+
+    headers = asyncio.run(build_session())
+    assert "X-Vault-Token" not in headers
+    assert headers["Content-Type"] == "application/json"
+
+def test_init_with_token():
+    """Test client initialization with explicit token"""
+    client = AsyncHCVSSClient(vault_token="test-token", base_url=BASE_URL)
+    assert client.headers == {"X-Vault-Token": "test-token"}
+    assert client._session is None
+
+@patch.dict('os.environ', {'VAULT_TOKEN': 'env-token'})
+def test_init_with_env_token():
+    """Test client initialization with environment token"""
+    client = AsyncHCVSSClient(base_url=BASE_URL)
+    assert client.vault_token == "env-token"
+
+def test_create_secret(client):
+    """Test creating a secret"""
+    result = asyncio.run(client.create_secret("secret", "my-secret", cas=0, data={"password": "secret123"}))
+
+    assert client._session.calls == [(
+        "POST",
+        f"{BASE_URL}/secret/data/my-secret",
+        {"options": {"cas": 0}, "data": {"password": "secret123"}}
+    )]
+    assert result == {"data": {"foo": "bar"}}
+
+def test_read_secrets_bulk(client):
+    """Test reading several secrets concurrently"""
+    result = asyncio.run(client.read_secrets_bulk("secret", ["a", "b"]))
+
+    assert set(result) == {"a", "b"}
+    assert sorted(url for _, url, _ in client._session.calls) == [
+        f"{BASE_URL}/secret/data/a",
+        f"{BASE_URL}/secret/data/b",
+    ]
+
+def test_read_secrets_bulk_rejects_mismatched_versions(client):
+    """Test a versions list that does not match the paths is rejected"""
+    with pytest.raises(ValueError):
+        asyncio.run(client.read_secrets_bulk("secret", ["a", "b"], versions=[1]))
+
+def test_max_concurrency_bounds_in_flight_requests():
+    """Test the semaphore caps the number of concurrent requests"""
+    client = AsyncHCVSSClient(vault_token="test-token", base_url=BASE_URL, max_concurrency=3)
+    client._session = FakeSession({})
+
+    asyncio.run(client.read_secrets_bulk("secret", [f"s{i}" for i in range(10)]))
+
+    assert len(client._session.calls) == 10
+    assert client._session.max_in_flight == 3
+
+def test_list_all_secrets_recursive(client):
+    """Test walking nested folders"""
+    client._session.responses = {
+        f"{BASE_URL}/secret/metadata/?list=true": {"data": {"keys": ["app/", "root-key"]}},
+        f"{BASE_URL}/secret/metadata/app/?list=true": {"data": {"keys": ["db"]}},
+    }
+
+    result = asyncio.run(client.list_all_secrets_recursive("secret"))
+
+    assert sorted(result) == ["app/db", "root-key"]
+
+def test_context_manager_closes_session(client):
+    """Test the session is closed when leaving the client context"""
+    session = client._session
+
+    async def use_client():
+        async with client:
+            pass
+
+    asyncio.run(use_client())
+    assert session.closed
+    assert client._session is None
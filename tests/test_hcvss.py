@@ -1,11 +1,12 @@
+import asyncio
 import os
 import json
 import pytest
-from unittest.mock import patch, mock_open
+from unittest.mock import MagicMock, Mock, patch, mock_open
 from hcvss.hcvss import SecretsScanner
 
-def test_init_with_missing_env_vars():
-    """Test initialization fails when environment variables are missing."""
+def test_base_url_with_missing_env_vars():
+    """Test building the HCP URL fails when environment variables are missing."""
     # Save any existing environment variables
     original_env = {
         'HCP_ORGANIZATION_ID': os.environ.get('HCP_ORGANIZATION_ID'),
@@ -19,8 +20,9 @@ def test_init_with_missing_env_vars():
             del os.environ[var]
 
     try:
+        scanner = SecretsScanner()
         with pytest.raises(EnvironmentError) as exc_info:
-            SecretsScanner()
+            scanner.base_url
         assert "Missing required environment variables" in str(exc_info.value)
     finally:
         # Restore the original environment variables
@@ -35,9 +37,11 @@ def scanner_with_env_vars():
         'HCP_ORGANIZATION_ID': 'test-org',
         'HCP_PROJECT_ID': 'test-project',
         'HCP_APP_NAME': 'test-app',
+        'HCP_CLIENT_ID': 'test-id',
+        'HCP_CLIENT_SECRET': 'test-secret',
     }
     with patch.dict(os.environ, env_vars):
-        return SecretsScanner()
+        yield SecretsScanner()
 
 def test_init_success(scanner_with_env_vars):
     """Test successful initialization with all required environment variables."""
@@ -47,7 +51,7 @@ def test_init_success(scanner_with_env_vars):
     assert "test-project" in scanner.base_url
     assert "test-app" in scanner.base_url
 
-def test_check_secrets_with_short_secrets(scanner_with_env_vars):
+def test_check_secrets_with_short_secrets(scanner_with_env_vars, tmp_path):
     """Test check_secrets identifies short secrets correctly."""
     mock_json_data = {
         "secrets": [
@@ -57,26 +61,98 @@ def test_check_secrets_with_short_secrets(scanner_with_env_vars):
         ]
     }
 
-    with patch("builtins.open", mock_open(read_data=json.dumps(mock_json_data))):
-        messages = scanner_with_env_vars.check_secrets("fake_path.json")
+    path = tmp_path / "secrets.json"
+    path.write_text(json.dumps(mock_json_data))
+
+    messages = scanner_with_env_vars.check_secrets(str(path))
 
     assert len(messages) == 2
     assert "Secret short is too short" in messages[0]
     assert "Secret also_short is too short" in messages[1]
 
-def test_get_secret_values_file_not_found(scanner_with_env_vars):
-    """Test _get_secret_values handles missing files."""
-    result = scanner_with_env_vars._get_secret_values("nonexistent_file.json")
+def test_check_secrets_is_silent(scanner_with_env_vars, capsys):
+    """Test check_secrets returns its messages without printing them."""
+    client = Mock()
+    client.bulk_read_secret_versions.return_value = {"app/db": {"data": {"data": {"a": "short", "b": "tiny"}}}}
+
+    messages = scanner_with_env_vars.check_secrets(client=client, paths=["app/db"])
+
+    assert messages == ["Secret short is too short: 5 characters", "Secret tiny is too short: 4 characters"]
+    assert capsys.readouterr() == ("", "")
+
+def test_check_secrets_without_env_vars(tmp_path):
+    """Test checking a local file does not require the HCP environment variables."""
+    path = tmp_path / "secrets.json"
+    path.write_text(json.dumps({"secrets": [{"static_version": {"value": "short"}}]}))
+
+    with patch.dict(os.environ, clear=True):
+        messages = SecretsScanner().check_secrets(str(path))
+
+    assert messages == ["Secret short is too short: 5 characters"]
+
+@pytest.mark.parametrize("threshold", [10_000, 2])
+def test_check_secrets_parallel(scanner_with_env_vars, tmp_path, threshold):
+    """Test the parallel check matches the serial one, in-process and across workers."""
+    values = ["short", "this_is_long_enough_secret", "also_short", "tiny", "x" * 25]
+    path = tmp_path / "secrets.json"
+    path.write_text(json.dumps({"secrets": [{"static_version": {"value": value}} for value in values]}))
+
+    with patch("hcvss.hcvss.PARALLEL_THRESHOLD", threshold):
+        messages = scanner_with_env_vars.check_secrets_parallel(str(path), workers=2)
+
+    assert messages == scanner_with_env_vars.check_secrets(str(path))
+    assert len(messages) == 3
+
+def test_check_secrets_from_parsed_data(scanner_with_env_vars):
+    """Test check_secrets checks an already parsed document without touching the disk."""
+    data = {"secrets": [{"static_version": {"value": "short"}}, {"static_version": {"value": "x" * 25}}]}
+
+    with patch("builtins.open") as mock_file:
+        messages = scanner_with_env_vars.check_secrets(data=data)
+
+    mock_file.assert_not_called()
+    assert messages == ["Secret short is too short: 5 characters"]
+
+def test_check_secrets_from_vault_paths(scanner_with_env_vars):
+    """Test check_secrets reads Vault paths through the bulk client read."""
+    client = Mock()
+    client.bulk_read_secret_versions.return_value = {
+        "app/db": {"data": {"data": {"password": "short", "user": "a_long_enough_username_value"}}},
+        "app/api": {"data": {"data": {"key": "tiny"}}},
+    }
+
+    messages = scanner_with_env_vars.check_secrets(client=client, paths=["app/db", "app/api"])
+
+    client.bulk_read_secret_versions.assert_called_once_with("secret", ["app/db", "app/api"])
+    assert messages == [
+        "Secret short is too short: 5 characters",
+        "Secret tiny is too short: 4 characters",
+    ]
+
+def test_iter_secret_values_is_lazy(scanner_with_env_vars, tmp_path):
+    """Test _iter_secret_values yields values one at a time instead of building a list."""
+    path = tmp_path / "secrets.json"
+    path.write_text(json.dumps({"secrets": [{"static_version": {"value": "a"}}, {"static_version": {"value": "b"}}]}))
+
+    values = scanner_with_env_vars._iter_secret_values(str(path))
+
+    assert not isinstance(values, list)
+    assert next(values) == "a"
+    assert list(values) == ["b"]
+
+def test_iter_secret_values_file_not_found(scanner_with_env_vars):
+    """Test _iter_secret_values handles missing files."""
+    result = list(scanner_with_env_vars._iter_secret_values("nonexistent_file.json"))
     assert result == []
 
-def test_get_secret_values_invalid_json(scanner_with_env_vars):
-    """Test _get_secret_values handles invalid JSON."""
-    with patch("builtins.open", mock_open(read_data="invalid json")):
-        result = scanner_with_env_vars._get_secret_values("fake_path.json")
+def test_iter_secret_values_invalid_json(scanner_with_env_vars):
+    """Test _iter_secret_values handles invalid JSON."""
+    with patch("builtins.open", mock_open(read_data=b"invalid json")):
+        result = list(scanner_with_env_vars._iter_secret_values("fake_path.json"))
     assert result == []
 
-def test_get_secret_values_success(scanner_with_env_vars):
-    """Test _get_secret_values successfully extracts secret values."""
+def test_iter_secret_values_success(scanner_with_env_vars, tmp_path):
+    """Test _iter_secret_values successfully extracts secret values."""
     mock_json_data = {
         "secrets": [
             {"static_version": {"value": "secret1"}},
@@ -84,58 +160,178 @@ def test_get_secret_values_success(scanner_with_env_vars):
         ]
     }
 
-    with patch("builtins.open", mock_open(read_data=json.dumps(mock_json_data))):
-        result = scanner_with_env_vars._get_secret_values("fake_path.json")
+    path = tmp_path / "secrets.json"
+    path.write_text(json.dumps(mock_json_data))
+
+    result = list(scanner_with_env_vars._iter_secret_values(str(path)))
 
     assert result == ["secret1", "secret2"]
 
-@patch('subprocess.run')
-def test_generate_hcp_api_token_success(mock_run, scanner_with_env_vars):
+@pytest.mark.parametrize("streaming", [True, False])
+def test_iter_secret_values_with_and_without_ijson(scanner_with_env_vars, tmp_path, streaming):
+    """Test _iter_secret_values gives the same values whether or not it streams the file."""
+    ijson = pytest.importorskip("ijson") if streaming else None
+    mock_json_data = {
+        "secrets": [
+            {"static_version": {"value": "secret1"}},
+            {"name": "no-version"},
+        ]
+    }
+    path = tmp_path / "secrets.json"
+    path.write_text(json.dumps(mock_json_data))
+
+    with patch("hcvss.hcvss.ijson", ijson):
+        result = list(scanner_with_env_vars._iter_secret_values(str(path)))
+
+    assert result == ["secret1", "No value found"]
+
+def test_iter_secret_values_empty_file_without_ijson(scanner_with_env_vars, tmp_path):
+    """Test an empty file is reported as invalid JSON when it cannot be memory-mapped."""
+    path = tmp_path / "secrets.json"
+    path.write_bytes(b"")
+
+    with patch("hcvss.hcvss.ijson", None):
+        assert list(scanner_with_env_vars._iter_secret_values(str(path))) == []
+
+def mock_http_response(payload):
+    """Create a mock HTTP response returning the given JSON payload."""
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.content = json.dumps(payload).encode()
+    response.iter_content.return_value = [response.content[:5], response.content[5:]]
+    return response
+
+@patch('requests.Session.post')
+def test_generate_hcp_api_token_success(mock_post, scanner_with_env_vars):
     """Test successful API token generation."""
-    mock_run.side_effect = [
-        type('Response', (), {
-            'stdout': '{"access_token": "test-token"}',
-            'stderr': '',
-            'returncode': 0
-        }),
-        type('Response', (), {
-            'stdout': 'test-token\n',
-            'stderr': '',
-            'returncode': 0
-        })
-    ]
+    mock_post.return_value = mock_http_response({"access_token": "test-token"})
 
     token = scanner_with_env_vars._generate_hcp_api_token("test-id", "test-secret")
     assert token == "test-token"
+    assert mock_post.call_args.kwargs["data"]["client_id"] == "test-id"
+    assert mock_post.call_args.kwargs["timeout"] == 10
+    assert mock_post.call_args.kwargs["headers"] == {"Authorization": None}
+
+@patch('requests.Session.post')
+def test_generate_hcp_api_token_missing_token(mock_post, scanner_with_env_vars):
+    """Test token generation fails when the response has no access token."""
+    mock_post.return_value = mock_http_response({})
+
+    with pytest.raises(ValueError):
+        scanner_with_env_vars._generate_hcp_api_token("test-id", "test-secret")
+
+@patch('requests.Session.post')
+def test_generate_hcp_api_token_is_cached(mock_post, scanner_with_env_vars):
+    """Test the token is reused until shortly before it expires."""
+    mock_post.return_value = mock_http_response({"access_token": "test-token", "expires_in": 3600})
+
+    with patch('time.monotonic', return_value=1000):
+        first = scanner_with_env_vars._generate_hcp_api_token("test-id", "test-secret")
+        second = scanner_with_env_vars._generate_hcp_api_token("test-id", "test-secret")
+    assert first == second == "test-token"
+    mock_post.assert_called_once()
+
+    with patch('time.monotonic', return_value=1000 + 3600 - 30):
+        scanner_with_env_vars._generate_hcp_api_token("test-id", "test-secret")
+    assert mock_post.call_count == 2
 
-@patch('subprocess.run')
-def test_fetch_hcp_secrets_success(mock_run, scanner_with_env_vars):
+@patch('requests.Session.post')
+def test_generate_hcp_api_token_cache_is_per_client(mock_post, scanner_with_env_vars):
+    """Test a cached token is not reused for other credentials."""
+    mock_post.return_value = mock_http_response({"access_token": "test-token", "expires_in": 3600})
+
+    scanner_with_env_vars._generate_hcp_api_token("test-id", "test-secret")
+    scanner_with_env_vars._generate_hcp_api_token("other-id", "other-secret")
+    assert mock_post.call_count == 2
+
+@patch('requests.Session.get')
+@patch('requests.Session.post')
+def test_fetch_hcp_secrets_success(mock_post, mock_get, scanner_with_env_vars, tmp_path):
     """Test successful secrets fetching."""
-    mock_run.side_effect = [
-        # Mock token generation
-        type('Response', (), {
-            'stdout': '{"access_token": "test-token"}',
-            'stderr': '',
-            'returncode': 0
-        }),
-        type('Response', (), {
-            'stdout': 'test-token\n',
-            'stderr': '',
-            'returncode': 0
-        }),
-        # Mock secrets fetch
-        type('Response', (), {
-            'stdout': '{"secrets": []}',
-            'stderr': '',
-            'returncode': 0
-        }),
-        type('Response', (), {
-            'stdout': '{"secrets": []}',
-            'stderr': '',
-            'returncode': 0
-        })
-    ]
+    mock_post.return_value = mock_http_response({"access_token": "test-token"})
+    mock_get.return_value = mock_http_response({"secrets": []})
+    filename = tmp_path / "secrets.json"
 
-    result = scanner_with_env_vars.fetch_hcp_secrets()
+    with patch.dict(os.environ, {'HCP_CLIENT_ID': 'changed-id'}):
+        result = scanner_with_env_vars.fetch_hcp_secrets(str(filename))
     assert isinstance(result, dict)
-    assert "secrets" in result
\ No newline at end of file
+    assert "secrets" in result
+    assert scanner_with_env_vars.session.headers["Authorization"] == "Bearer test-token"
+    assert mock_post.call_args.kwargs["data"]["client_id"] == "test-id"
+    assert mock_get.call_args.args == (scanner_with_env_vars.base_url + "/secrets:open",)
+    assert mock_get.call_args.kwargs["stream"] is True
+    assert mock_get.call_args.kwargs["timeout"] == 30
+    assert json.loads(filename.read_text()) == {"secrets": []}
+
+@patch('requests.Session.get')
+@patch('requests.Session.post')
+def test_fetch_hcp_secrets_without_filename(mock_post, mock_get, scanner_with_env_vars, tmp_path, capsys, monkeypatch):
+    """Test fetching secrets without a filename writes and prints nothing."""
+    mock_post.return_value = mock_http_response({"access_token": "test-token"})
+    mock_get.return_value = mock_http_response({"secrets": []})
+    monkeypatch.chdir(tmp_path)
+
+    result = scanner_with_env_vars.fetch_hcp_secrets()
+    assert result == {"secrets": []}
+    assert list(tmp_path.iterdir()) == []
+    assert capsys.readouterr().out == ""
+
+@patch('requests.Session.get')
+@patch('requests.Session.post')
+def test_fetch_hcp_secrets_for_apps(mock_post, mock_get, scanner_with_env_vars):
+    """Test secrets of several apps are fetched from a thread pool over the shared session."""
+    mock_post.return_value = mock_http_response({"access_token": "test-token", "expires_in": 3600})
+    mock_get.side_effect = lambda url, **kwargs: mock_http_response({"url": url})
+
+    result = scanner_with_env_vars.fetch_hcp_secrets_for_apps(["app-a", "app-b", "app-c"], max_workers=2)
+
+    project_url = scanner_with_env_vars.base_url.rpartition("/apps/")[0]
+    assert result == {app: {"url": f"{project_url}/apps/{app}/secrets:open"} for app in ["app-a", "app-b", "app-c"]}
+    assert scanner_with_env_vars.session.headers["Authorization"] == "Bearer test-token"
+    mock_post.assert_called_once()
+
+@patch('requests.Session.post')
+def test_fetch_hcp_secrets_async(mock_post, scanner_with_env_vars):
+    """Test secrets of several apps are fetched over one aiohttp session."""
+    aiohttp = pytest.importorskip("aiohttp")
+    mock_post.return_value = mock_http_response({"access_token": "test-token", "expires_in": 3600})
+    requested = []
+
+    class FakeResponse:
+        def __init__(self, url):
+            self.url = url
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            return False
+
+        def raise_for_status(self):
+            pass
+
+        async def read(self):
+            return json.dumps({"secrets": [], "url": self.url}).encode()
+
+    class FakeSession:
+        def __init__(self, connector=None, headers=None, timeout=None):
+            self.headers = headers
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            return False
+
+        def get(self, url):
+            requested.append((url, self.headers))
+            return FakeResponse(url)
+
+    with patch.object(aiohttp, "ClientSession", FakeSession), patch.object(aiohttp, "TCPConnector"):
+        result = asyncio.run(scanner_with_env_vars.fetch_hcp_secrets_async(["app-a", "app-b"]))
+
+    project_url = scanner_with_env_vars.base_url.rpartition("/apps/")[0]
+    assert list(result) == ["app-a", "app-b"]
+    assert result["app-b"]["url"] == project_url + "/apps/app-b/secrets:open"
+    assert all(headers == {"Authorization": "Bearer test-token"} for _, headers in requested)
+    mock_post.assert_called_once()